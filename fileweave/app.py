@@ -1,21 +1,109 @@
-import tkinter as tk
+import time
 
-from fileweave.ui.main_window import MainWindow
+# Taken before any other import so the startup profile covers them
+_IMPORT_START = time.perf_counter()
+
+import argparse
+import sys
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import tkinter as tk
+
+    from fileweave.daemon.client import DaemonClient
+
+class StartupProfiler:
+    """
+    Records how long each startup step takes.
+    """
+
+    def __init__(self, enabled: bool = False, start: Optional[float] = None):
+        """
+        Initializes the StartupProfiler class.
+
+        Args:
+            enabled: Whether timings should be reported.
+            start: The perf_counter value the total is measured from, now by default.
+        """
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self.timings: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def step(self, label: str) -> Iterator[None]:
+        """
+        Times a startup step.
+
+        Args:
+            label: The name of the step.
+        """
+        step_start = time.perf_counter()
+        yield
+        self.record(label, step_start)
+
+    def record(self, label: str, step_start: float):
+        """
+        Records a step that started earlier and has just finished.
+
+        Args:
+            label: The name of the step.
+            step_start: The perf_counter value when the step started.
+        """
+        self.timings.append((label, time.perf_counter() - step_start))
+
+    def report(self):
+        """Writes the recorded timings to stderr if profiling is enabled."""
+        if not self.enabled:
+            return
+        for label, elapsed in self.timings:
+            print(f"{label:<32} {elapsed * 1000:8.1f} ms", file=sys.stderr)
+        total = time.perf_counter() - self.start
+        print(f"{'total':<32} {total * 1000:8.1f} ms", file=sys.stderr)
 
 class FileWeaveApp:
     """
     Main application class for FileWeave.
     """
 
-    def __init__(self, root: tk.Tk):
+    def __init__(
+        self,
+        root: "tk.Tk",
+        daemon_client: Optional["DaemonClient"] = None,
+        profiler: Optional[StartupProfiler] = None
+    ):
         """
         Initializes the FileWeave application.
 
+        The window is shown as soon as it is built, and the previous session
+        is restored once the event loop is running.
+
         Args:
             root: The root Tkinter window.
+            daemon_client: Client of a running daemon to generate output with, if any.
+            profiler: The profiler recording startup timings.
         """
         self.root = root
-        self.main_window = MainWindow(self.root)
+        self.profiler = profiler or StartupProfiler()
+
+        with self.profiler.step("import fileweave.ui"):
+            from fileweave.ui.main_window import MainWindow
+
+        with self.profiler.step("build main window"):
+            self.main_window = MainWindow(self.root, daemon_client)
+            self.root.update_idletasks()
+
+        self.root.after_idle(self.restore_session)
+
+    def restore_session(self):
+        """Restores the previous session after the window has been shown."""
+        step_start = time.perf_counter()
+
+        def _done():
+            self.profiler.record("restore session", step_start)
+            self.profiler.report()
+
+        self.main_window.restore_session(_done)
 
     def run(self):
         """
@@ -23,7 +111,46 @@ class FileWeaveApp:
         """
         self.root.mainloop()
 
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = FileWeaveApp(root)
+def main(argv: Optional[List[str]] = None):
+    """
+    Parses the command line and starts the application.
+
+    Args:
+        argv: The command line arguments, sys.argv by default.
+    """
+    profiler = StartupProfiler(start=_IMPORT_START)
+    parser = argparse.ArgumentParser(prog="fileweave")
+    parser.add_argument(
+        "--connect",
+        metavar="ADDRESS",
+        help="generate output through a running daemon at this Unix socket path or loopback [host:]port"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report import and initialization timings to stderr, measured from "
+             "when fileweave.app starts loading (interpreter startup is not included)"
+    )
+    args = parser.parse_args(argv)
+    profiler.enabled = args.profile_startup
+
+    daemon_client = None
+    if args.connect:
+        from fileweave.daemon.client import DaemonClient
+
+        try:
+            daemon_client = DaemonClient(args.connect)
+        except ValueError as e:
+            parser.error(str(e))
+
+    with profiler.step("import tkinter"):
+        import tkinter as tk
+
+    with profiler.step("create root window"):
+        root = tk.Tk()
+
+    app = FileWeaveApp(root, daemon_client, profiler)
     app.run()
+
+if __name__ == "__main__":
+    main()
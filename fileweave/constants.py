@@ -2,6 +2,9 @@
 Constants used throughout the FileWeave application.
 """
 
+import os
+import socket
+
 APP_TITLE = "FileWeave"
 VERSION = "0.2.0"
 INITIAL_GEOMETRY = "1000x700"
@@ -22,3 +25,16 @@ ICONS = {
     'LICENSE': '⚖️',
     'README': '📖',
 }
+
+PROJECT_CONFIG_DIR = ".fileweave"
+PRESETS_FILE = "presets.json"
+USER_CONFIG_DIR = os.path.join(os.path.expanduser("~"), PROJECT_CONFIG_DIR)
+
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 47474
+DAEMON_SOCKET = os.path.join(USER_CONFIG_DIR, "daemon.sock")
+DAEMON_TOKEN_FILE = os.path.join(USER_CONFIG_DIR, "daemon.token")
+DEFAULT_DAEMON_ADDRESS = DAEMON_SOCKET if hasattr(socket, 'AF_UNIX') else str(DAEMON_PORT)
+DAEMON_POLL_INTERVAL = 2.0
+
+SESSION_FILE = os.path.join(USER_CONFIG_DIR, "session.json")
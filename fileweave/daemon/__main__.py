@@ -0,0 +1,3 @@
+from fileweave.daemon.server import main
+
+main()
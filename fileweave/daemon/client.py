@@ -0,0 +1,207 @@
+"""
+Client for the FileWeave daemon, usable from the GUI and from scripts.
+
+Scripts can also build a bundle locally, without a daemon, with --local.
+"""
+
+import argparse
+import socket
+import sys
+from typing import Dict, Iterator, List, Optional
+
+from fileweave.constants import DAEMON_TOKEN_FILE, DEFAULT_DAEMON_ADDRESS
+from fileweave.daemon.protocol import parse_address, read_message, read_token, send_message
+
+class DaemonError(Exception):
+    """
+    Raised when the daemon rejects a request.
+    """
+
+class DaemonClient:
+    """
+    Sends requests to a running FileWeave daemon.
+    """
+
+    def __init__(
+        self,
+        address: str = DEFAULT_DAEMON_ADDRESS,
+        timeout: Optional[float] = 10.0,
+        token_file: str = DAEMON_TOKEN_FILE
+    ):
+        """
+        Initializes the DaemonClient class.
+
+        Args:
+            address: The daemon address, see parse_address.
+            timeout: The socket timeout in seconds, or None to wait forever.
+            token_file: The token file written by a daemon listening on TCP.
+        """
+        self.address = address
+        self.timeout = timeout
+        self.token_file = token_file
+        self.family, self.socket_address = parse_address(address)
+
+    def _request(self, message: Dict) -> Iterator[Dict]:
+        """
+        Sends a request and yields the response messages until the final one.
+
+        Args:
+            message: The request message.
+
+        Yields:
+            Each response message, including the final 'done' message.
+
+        Raises:
+            DaemonError: If the daemon answers with an error.
+            OSError: If the daemon cannot be reached.
+        """
+        if self.family != getattr(socket, 'AF_UNIX', None):
+            message = dict(message, token=read_token(self.token_file))
+        with socket.socket(self.family, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_address)
+            with sock.makefile('rwb') as stream:
+                send_message(stream, message)
+                while True:
+                    response = read_message(stream)
+                    if response is None:
+                        raise DaemonError("Connection closed by daemon")
+                    if response['type'] == 'error':
+                        raise DaemonError(response['message'])
+                    yield response
+                    if response['type'] == 'done':
+                        return
+
+    def ping(self) -> List[str]:
+        """
+        Checks that the daemon is running.
+
+        Returns:
+            The paths of the roots indexed by the daemon.
+        """
+        return list(self._request({'action': 'ping'}))[-1]['roots']
+
+    def add_roots(self, roots: List[str]) -> List[str]:
+        """
+        Asks the daemon to index directories.
+
+        Args:
+            roots: The paths of the directories.
+
+        Returns:
+            The paths of the indexed roots.
+        """
+        return list(self._request({'action': 'add_roots', 'roots': roots}))[-1]['roots']
+
+    def bundle(
+        self,
+        roots: Optional[List[str]] = None,
+        paths: Optional[List[str]] = None,
+        globs: Optional[List[str]] = None,
+        preset: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Requests a bundle and streams it back block by block.
+
+        Args:
+            roots: Indexed roots to restrict the request to, all indexed roots by default.
+            paths: Files to include, either absolute or prefixed with the root name.
+            globs: Glob patterns matched against paths relative to each root.
+            preset: Name of a preset stored in the selected roots.
+
+        Yields:
+            The formatted block of each file.
+        """
+        request = {'action': 'bundle', 'roots': roots, 'paths': paths, 'globs': globs, 'preset': preset}
+        for response in self._request(request):
+            if response['type'] == 'chunk':
+                yield response['data']
+
+def bundle_locally(
+    roots: List[str],
+    paths: Optional[List[str]] = None,
+    globs: Optional[List[str]] = None,
+    preset: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Scans the roots and renders a bundle in this process, without a daemon.
+
+    The same selection rules as the daemon apply, since both use BundleIndex.
+
+    Args:
+        roots: The root directories to scan.
+        paths: Files to include, either absolute or prefixed with the root name.
+        globs: Glob patterns matched against paths relative to each root.
+        preset: Name of a preset stored in the roots.
+
+    Yields:
+        The formatted block of each file.
+
+    Raises:
+        ValueError: If a root or path is invalid, or no root defines the preset.
+    """
+    from fileweave.daemon.server import BundleIndex
+
+    index = BundleIndex()
+    index.add_roots(roots)
+    yield from index.bundle(index.select(paths=paths, globs=globs, preset=preset))
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Writes a bundle to stdout, requested from the daemon or built locally.
+
+    Args:
+        argv: The command line arguments, sys.argv by default.
+    """
+    parser = argparse.ArgumentParser(
+        prog="fileweave-client",
+        description="Request a bundle from a running FileWeave daemon, or build it locally."
+    )
+    parser.add_argument("paths", nargs="*", help="files to include, absolute or as root_name/relative_path")
+    parser.add_argument(
+        "--connect",
+        default=DEFAULT_DAEMON_ADDRESS,
+        help="Unix socket path or loopback [host:]port of the daemon (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="scan the --root directories in this process instead of asking a daemon"
+    )
+    parser.add_argument(
+        "--root",
+        action="append",
+        dest="roots",
+        help="restrict the bundle to this root; with --local, a directory to scan"
+    )
+    parser.add_argument(
+        "--add-root",
+        action="append",
+        dest="add_roots",
+        default=[],
+        help="ask the daemon to index this directory before bundling"
+    )
+    parser.add_argument("--glob", action="append", dest="globs", help="include files matching this pattern")
+    parser.add_argument("--preset", help="include the files selected by this saved preset")
+    args = parser.parse_args(argv)
+
+    if args.local and not args.roots:
+        parser.error("--local requires at least one --root")
+    if args.local and args.add_roots:
+        parser.error("--add-root cannot be used with --local")
+
+    try:
+        if args.local:
+            blocks = bundle_locally(args.roots, args.paths, args.globs, args.preset)
+        else:
+            client = DaemonClient(args.connect, timeout=None)
+            if args.add_roots:
+                client.add_roots(args.add_roots)
+            blocks = client.bundle(args.roots, args.paths, args.globs, args.preset)
+        for block in blocks:
+            sys.stdout.write(block)
+    except (DaemonError, OSError, ValueError) as e:
+        parser.exit(1, f"fileweave-client: {e}\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Wire protocol shared by the FileWeave daemon and its clients.
+
+Messages are JSON objects, one per line. A client sends a single request and
+reads response messages until it receives one of type 'done' or 'error'.
+
+Unix domain sockets are only accessible to their owner. TCP connections are
+limited to loopback addresses and every request must carry the token the
+daemon wrote to its token file on startup.
+"""
+
+import ipaddress
+import json
+import os
+import secrets
+import socket
+from typing import BinaryIO, Dict, Optional, Tuple, Union
+
+from fileweave.constants import DAEMON_HOST
+
+Address = Union[str, Tuple[str, int]]
+
+def parse_address(address: str) -> Tuple[int, Address]:
+    """
+    Parses a daemon address into a socket family and a socket address.
+
+    Accepted forms are 'unix:/path/to.sock' or any path containing a slash for
+    Unix domain sockets, 'host:port' and a bare 'port' for TCP on localhost.
+
+    Args:
+        address: The address string.
+
+    Returns:
+        A tuple of the socket family and the address to bind or connect to.
+
+    Raises:
+        ValueError: If the address cannot be parsed or the host is not a loopback address.
+    """
+    if address.startswith('unix:') or '/' in address:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError("Unix domain sockets are not supported on this platform")
+        return socket.AF_UNIX, address[len('unix:'):] if address.startswith('unix:') else address
+
+    host, _, port = address.rpartition(':')
+    host = host.strip('[]') or DAEMON_HOST
+    if not port.isdigit():
+        raise ValueError(f"Invalid daemon address: {address}")
+    if host == 'localhost':
+        host = DAEMON_HOST
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        raise ValueError(f"Invalid daemon host: {host}") from None
+    if not ip.is_loopback:
+        raise ValueError(f"Daemon host must be a loopback address: {host}")
+    return socket.AF_INET6 if ip.version == 6 else socket.AF_INET, (host, int(port))
+
+def write_token(path: str) -> str:
+    """
+    Generates a new access token and writes it to a file only the owner can read.
+
+    Args:
+        path: The path of the token file.
+
+    Returns:
+        The token.
+    """
+    token = secrets.token_hex(32)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.unlink(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    return token
+
+def read_token(path: str) -> Optional[str]:
+    """
+    Reads the access token written by the daemon.
+
+    Args:
+        path: The path of the token file.
+
+    Returns:
+        The token, or None if the file does not exist.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+def send_message(stream: BinaryIO, message: Dict):
+    """
+    Writes a message to a stream.
+
+    Args:
+        stream: The writable binary stream.
+        message: The message to send.
+    """
+    stream.write(json.dumps(message).encode('utf-8') + b'\n')
+    stream.flush()
+
+def read_message(stream: BinaryIO) -> Optional[Dict]:
+    """
+    Reads a message from a stream.
+
+    Args:
+        stream: The readable binary stream.
+
+    Returns:
+        The message, or None if the stream was closed.
+
+    Raises:
+        ValueError: If the line is not a JSON object.
+    """
+    line = stream.readline()
+    if not line:
+        return None
+    message = json.loads(line.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("Message must be a JSON object")
+    return message
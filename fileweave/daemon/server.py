@@ -0,0 +1,459 @@
+"""
+Local daemon that serves bundles from a warm in-memory index.
+
+The daemon keeps the scan of every workspace root, their ignore rules and the
+rendered file blocks in memory, and answers bundle requests over a Unix domain
+socket or a localhost TCP port. Only the roots passed on the command line or
+through an explicit add_roots request are indexed, and only files in that
+index are ever read.
+"""
+
+import argparse
+import hmac
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from fileweave.constants import DAEMON_POLL_INTERVAL, DAEMON_TOKEN_FILE, DEFAULT_DAEMON_ADDRESS
+from fileweave.daemon.protocol import parse_address, read_message, read_token, send_message, write_token
+from fileweave.utils.bundle import BundleCache
+from fileweave.utils.presets import evaluate_preset
+from fileweave.utils.workspace import WorkspaceRoot, compile_patterns, find_conflict, find_root, scan_roots
+
+class BundleIndex:
+    """
+    Warm index of workspace roots shared by every daemon connection.
+    """
+
+    def __init__(self, show_hidden: bool = False, use_gitignore: bool = True):
+        """
+        Initializes the BundleIndex class.
+
+        Args:
+            show_hidden: Whether hidden files should be indexed.
+            use_gitignore: Whether .gitignore rules should be respected.
+        """
+        self.show_hidden = show_hidden
+        self.use_gitignore = use_gitignore
+        self.roots: List[WorkspaceRoot] = []
+        self.cache = BundleCache()
+        self._lock = threading.Lock()
+
+    def add_roots(self, paths: Iterable[str]) -> List[WorkspaceRoot]:
+        """
+        Adds directories to the index, scanning the new ones in parallel.
+
+        The request is validated before anything is added, so a rejected
+        request leaves the index unchanged.
+
+        Args:
+            paths: The paths of the directories.
+
+        Returns:
+            The workspace roots for the given paths, in the same order.
+
+        Raises:
+            ValueError: If a path is not a directory, or overlaps or shares a name with an indexed root.
+        """
+        requested = [os.path.abspath(path) for path in paths]
+        with self._lock:
+            accepted = list(self.roots)
+        new_roots = []
+        for path in dict.fromkeys(requested):
+            if any(root.path == path for root in accepted):
+                continue
+            if not os.path.isdir(path):
+                raise ValueError(f"Not a directory: {path}")
+            root = WorkspaceRoot(path)
+            conflict = find_conflict(accepted, root)
+            if conflict:
+                raise ValueError(conflict)
+            accepted.append(root)
+            new_roots.append(root)
+
+        scan_roots(new_roots, self.show_hidden, self.use_gitignore, force=True)
+
+        with self._lock:
+            for root in new_roots:
+                if any(existing.path == root.path for existing in self.roots):
+                    continue
+                # Another connection may have added a root since the check above
+                conflict = find_conflict(self.roots, root)
+                if conflict:
+                    raise ValueError(conflict)
+            for root in new_roots:
+                if not any(existing.path == root.path for existing in self.roots):
+                    self.roots.append(root)
+            known = {root.path: root for root in self.roots}
+        return [known[path] for path in requested]
+
+    def get_roots(self, paths: Optional[List[str]] = None) -> List[WorkspaceRoot]:
+        """
+        Returns indexed roots by path.
+
+        Args:
+            paths: The paths of the roots, all indexed roots by default.
+
+        Returns:
+            The workspace roots, in the requested order.
+
+        Raises:
+            ValueError: If a path is not an indexed root.
+        """
+        with self._lock:
+            known = {root.path: root for root in self.roots}
+        if not paths:
+            return list(known.values())
+
+        roots = []
+        for path in paths:
+            root = known.get(os.path.abspath(path))
+            if root is None:
+                raise ValueError(f"Not an indexed root: {path}")
+            roots.append(root)
+        return roots
+
+    def refresh(self) -> List[WorkspaceRoot]:
+        """
+        Rescans the roots that changed on disk.
+
+        Returns:
+            The roots that were rescanned.
+        """
+        with self._lock:
+            roots = list(self.roots)
+        rescanned = scan_roots(roots, self.show_hidden, self.use_gitignore)
+        for root in rescanned:
+            # Drop blocks of files that were deleted, renamed or are now ignored
+            self.cache.prune(root, set(root.files()))
+        return rescanned
+
+    def select(
+        self,
+        roots: Optional[List[str]] = None,
+        paths: Optional[List[str]] = None,
+        globs: Optional[List[str]] = None,
+        preset: Optional[str] = None
+    ) -> List[Tuple[WorkspaceRoot, str]]:
+        """
+        Resolves a bundle request into the files it covers.
+
+        Only files in the index of the selected roots can be returned.
+
+        Args:
+            roots: Indexed roots to restrict the request to, all indexed roots by default.
+            paths: Files to include, either absolute or prefixed with the root name.
+            globs: Glob patterns matched against paths relative to each root.
+            preset: Name of a preset stored in the selected roots.
+
+        Returns:
+            A list of (root, path) tuples, grouped by root and sorted by path.
+
+        Raises:
+            ValueError: If a root is not indexed, a path is not an indexed file
+                of the selected roots, or no selected root defines the preset.
+        """
+        targets = self.get_roots(roots)
+        by_name = {root.name: root for root in targets}
+        indexed_files: Dict[str, Set[str]] = {}
+
+        def _is_indexed(root: WorkspaceRoot, path: str) -> bool:
+            if root.path not in indexed_files:
+                indexed_files[root.path] = set(root.files())
+            return path in indexed_files[root.path]
+
+        selected: Dict[str, WorkspaceRoot] = {}
+        for path in paths or []:
+            if os.path.isabs(path):
+                full_path = os.path.normpath(path)
+                root = find_root(targets, full_path)
+            else:
+                name, _, relative_path = path.replace('\\', '/').partition('/')
+                root = by_name.get(name)
+                full_path = os.path.normpath(os.path.join(root.path, relative_path)) if root else path
+            if root is None or not root.contains(full_path) or not _is_indexed(root, full_path):
+                raise ValueError(f"Not in workspace: {path}")
+            selected[full_path] = root
+
+        if globs:
+            spec = compile_patterns(globs)
+            for root in targets:
+                for path in root.match_files(spec):
+                    selected[path] = root
+
+        if preset:
+            try:
+                for path in evaluate_preset(targets, preset):
+                    selected[path] = find_root(targets, path)
+            except KeyError:
+                raise ValueError(f"Unknown preset: {preset}") from None
+            except OSError as e:
+                raise ValueError(f"Cannot read presets: {e}") from None
+
+        order = {root.path: index for index, root in enumerate(targets)}
+        return sorted(
+            ((root, path) for path, root in selected.items()),
+            key=lambda item: (order[item[0].path], item[1])
+        )
+
+    def bundle(self, files: List[Tuple[WorkspaceRoot, str]]) -> Iterator[str]:
+        """
+        Renders the blocks of a bundle from the content cache.
+
+        Args:
+            files: The (root, path) tuples returned by select.
+
+        Yields:
+            The formatted block of each file.
+        """
+        for root, path in files:
+            yield self.cache.render(root, path)
+
+class BundleRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles a single client request on a daemon connection.
+    """
+
+    def handle(self):
+        """Reads a request and streams the response back to the client."""
+        index: BundleIndex = self.server.index
+        try:
+            request = read_message(self.rfile)
+            if request is None:
+                return
+
+            token = self.server.token
+            if token and not hmac.compare_digest(str(request.get('token', '')), token):
+                raise ValueError("Invalid or missing token")
+
+            action = request.get('action')
+            if action == 'ping':
+                send_message(self.wfile, {'type': 'done', 'roots': [root.path for root in index.get_roots()]})
+            elif action == 'add_roots':
+                roots = index.add_roots(_get_strings(request, 'roots') or [])
+                send_message(self.wfile, {'type': 'done', 'roots': [root.path for root in roots]})
+            elif action == 'bundle':
+                preset = request.get('preset')
+                if preset is not None and not isinstance(preset, str):
+                    raise ValueError("'preset' must be a string")
+                files = index.select(
+                    _get_strings(request, 'roots'),
+                    _get_strings(request, 'paths'),
+                    _get_strings(request, 'globs'),
+                    preset
+                )
+                for block in index.bundle(files):
+                    send_message(self.wfile, {'type': 'chunk', 'data': block})
+                send_message(self.wfile, {'type': 'done', 'files': len(files)})
+            else:
+                raise ValueError(f"Unknown action: {action}")
+        except ConnectionError:
+            pass
+        except ValueError as e:
+            self._send_error(str(e))
+        except Exception as e:
+            self._send_error(f"Internal error: {e}")
+
+    def _send_error(self, message: str):
+        try:
+            send_message(self.wfile, {'type': 'error', 'message': message})
+        except OSError:
+            pass
+
+def _get_strings(request: Dict, key: str) -> Optional[List[str]]:
+    """
+    Returns a request field that must be a list of strings.
+
+    Args:
+        request: The request message.
+        key: The field name.
+
+    Returns:
+        The list, or None if the field is missing.
+
+    Raises:
+        ValueError: If the field is not a list of strings.
+    """
+    value = request.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"'{key}' must be a list of strings")
+    return value
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+class _TCP6Server(_TCPServer):
+    address_family = socket.AF_INET6
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+def create_server(
+    address: str,
+    index: BundleIndex,
+    token_file: str = DAEMON_TOKEN_FILE
+) -> socketserver.BaseServer:
+    """
+    Creates a daemon server bound to an address.
+
+    TCP servers write a fresh access token to the token file, which clients
+    must send with every request.
+
+    Args:
+        address: The address to listen on, see parse_address.
+        index: The index the server answers from.
+        token_file: Where TCP servers write their access token.
+
+    Returns:
+        The bound server.
+
+    Raises:
+        ValueError: If another daemon is listening on the Unix socket.
+    """
+    family, bind_address = parse_address(address)
+    if family == getattr(socket, 'AF_UNIX', None):
+        os.makedirs(os.path.dirname(os.path.abspath(bind_address)), exist_ok=True)
+        _remove_stale_socket(bind_address)
+        # Create the socket with owner-only permissions from the start
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(bind_address, BundleRequestHandler)
+        finally:
+            os.umask(umask)
+        server.socket_id = _get_file_id(bind_address)
+        server.token = None
+    else:
+        server_class = _TCP6Server if family == socket.AF_INET6 else _TCPServer
+        server = server_class(bind_address, BundleRequestHandler)
+        server.socket_id = None
+        server.token = write_token(token_file)
+    server.token_file = token_file
+    server.index = index
+    return server
+
+def close_server(server: socketserver.BaseServer):
+    """
+    Closes a server created by create_server and removes the files it created.
+
+    The socket and token files are only removed if they still belong to this
+    server, so a daemon started later on the same address keeps working.
+
+    Args:
+        server: The server to close.
+    """
+    server.server_close()
+    if server.socket_id:
+        try:
+            if _get_file_id(server.server_address) == server.socket_id:
+                os.unlink(server.server_address)
+        except FileNotFoundError:
+            pass
+    if server.token and read_token(server.token_file) == server.token:
+        os.unlink(server.token_file)
+
+def _get_file_id(path: str) -> Tuple[int, int, int]:
+    """
+    Returns what tells a file apart from a later file at the same path.
+
+    The change time is included because a new file may reuse a freed inode.
+
+    Args:
+        path: The file path.
+
+    Returns:
+        The device, inode and change time of the file.
+    """
+    file_stat = os.stat(path)
+    return (file_stat.st_dev, file_stat.st_ino, file_stat.st_ctime_ns)
+
+def _remove_stale_socket(path: str):
+    """
+    Removes a socket file left behind by a daemon that is no longer running.
+
+    Args:
+        path: The socket path.
+
+    Raises:
+        ValueError: If a daemon is still listening on the socket.
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise ValueError(f"A daemon is already running on {path}")
+
+def watch(index: BundleIndex, interval: float, stop: threading.Event):
+    """
+    Keeps the index fresh by rescanning changed roots until stopped.
+
+    Args:
+        index: The index to refresh.
+        interval: The number of seconds between checks.
+        stop: Event that ends the loop when set.
+    """
+    while not stop.wait(interval):
+        index.refresh()
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Runs the FileWeave daemon.
+
+    Args:
+        argv: The command line arguments, sys.argv by default.
+    """
+    parser = argparse.ArgumentParser(
+        prog="fileweave-daemon",
+        description="Serve FileWeave bundles from a warm in-memory index."
+    )
+    parser.add_argument("roots", nargs="*", help="directories to index on startup")
+    parser.add_argument(
+        "--listen",
+        default=DEFAULT_DAEMON_ADDRESS,
+        help="Unix socket path or loopback [host:]port to listen on (default: %(default)s)"
+    )
+    parser.add_argument("--show-hidden", action="store_true", help="index hidden files")
+    parser.add_argument("--no-gitignore", action="store_true", help="ignore .gitignore rules")
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DAEMON_POLL_INTERVAL,
+        help="seconds between change checks (default: %(default)s)"
+    )
+    args = parser.parse_args(argv)
+
+    index = BundleIndex(show_hidden=args.show_hidden, use_gitignore=not args.no_gitignore)
+    try:
+        index.add_roots(args.roots)
+        server = create_server(args.listen, index)
+    except (ValueError, OSError) as e:
+        parser.exit(1, f"fileweave-daemon: {e}\n")
+
+    stop = threading.Event()
+    threading.Thread(target=watch, args=(index, args.poll_interval, stop), daemon=True).start()
+    print(f"FileWeave daemon listening on {args.listen}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        close_server(server)
+
+if __name__ == "__main__":
+    main()
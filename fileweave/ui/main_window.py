@@ -1,26 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import os
-from typing import Optional, Set
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
 import sys
 
 from fileweave.utils.file_utils import FileUtils
+from fileweave.utils.presets import SelectionPreset, evaluate_preset, load_presets, save_preset
+from fileweave.utils.session import load_session, save_session
 from fileweave.utils.treeview_utils import TreeViewUtils
+from fileweave.utils.workspace import WorkspaceRoot, find_conflict, find_root
 from fileweave.ui.menu_bar import MenuBar
 from fileweave.ui.styles import StyleManager
 from fileweave.constants import APP_TITLE, INITIAL_GEOMETRY
 
+if TYPE_CHECKING:
+    from fileweave.daemon.client import DaemonClient
+
 class MainWindow:
     """
     Main window class for the FileWeave application.
     """
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, daemon_client: Optional["DaemonClient"] = None):
         """
         Initializes the main window.
 
         Args:
             root: The root Tkinter window.
+            daemon_client: Client of a running daemon to generate output with, if any.
         """
         self.root = root
         self.root.title(APP_TITLE)
@@ -30,9 +37,12 @@ class MainWindow:
         if sys.platform == "darwin":
             self.root.createcommand('tk::mac::ReopenApplication', self.root.lift)
 
-        self.base_path: Optional[str] = None
-        self.base_dir_name: Optional[str] = None
+        self.roots: List[WorkspaceRoot] = []
+        self.daemon_client = daemon_client
         self.checked_items: Set[str] = set()
+        # The session being restored, and the actions waiting for it to finish
+        self.pending_session: Optional[Dict] = None
+        self.after_restore: List[Callable[[], None]] = []
 
         self.style_manager = StyleManager(self.root)
         self.file_utils = FileUtils(self)
@@ -41,6 +51,7 @@ class MainWindow:
         self.setup_ui()
         self.menu_bar = MenuBar(self.root, self)
         self.setup_bindings()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def setup_ui(self):
         """Sets up the user interface elements."""
@@ -131,6 +142,14 @@ class MainWindow:
         )
         select_btn.pack(side=tk.LEFT, padx=(0, 10))
 
+        add_btn = ttk.Button(
+            self.options_frame,
+            text="Add Directory",
+            command=self.add_directory,
+            padding=10
+        )
+        add_btn.pack(side=tk.LEFT, padx=(0, 10))
+
         self.use_gitignore = tk.BooleanVar(value=True)
         self.gitignore_check = ttk.Checkbutton(
             self.options_frame,
@@ -171,6 +190,12 @@ class MainWindow:
         # Configure tag for checked items
         self.tree.tag_configure('checked', background='#e8e8e8')
 
+        # Context menu for workspace roots
+        self.root_menu = tk.Menu(self.tree, tearoff=0)
+        self.root_menu.add_command(label="Refresh", command=self.refresh_context_root)
+        self.root_menu.add_command(label="Remove from Workspace", command=self.remove_context_root)
+        self.context_root: Optional[WorkspaceRoot] = None
+
         # Action buttons under the tree
         buttons_frame = ttk.Frame(left_frame)
         buttons_frame.grid(row=3, column=0, pady=10, sticky=(tk.W, tk.E))
@@ -260,16 +285,217 @@ class MainWindow:
         copy_shortcut = '<Command-c>' if sys.platform == "darwin" else '<Control-c>'
         self.root.bind(open_shortcut, lambda e: self.select_directory())
         self.root.bind(copy_shortcut, lambda e: self.file_utils.copy_to_clipboard())
+        refresh_shortcut = '<Command-r>' if sys.platform == "darwin" else '<F5>'
+        self.root.bind(refresh_shortcut, lambda e: self.treeview_utils.refresh_tree())
         self.tree.bind('<Button-1>', self.treeview_utils.toggle_check)
+        context_button = '<Button-2>' if sys.platform == "darwin" else '<Button-3>'
+        self.tree.bind(context_button, self.show_root_menu)
 
     def select_directory(self):
-        """Opens a directory selection dialog and populates the treeview."""
-        self.base_path = filedialog.askdirectory()
-        if self.base_path:
-            self.base_dir_name = os.path.basename(self.base_path)
-            self.dir_label.config(text=f"Selected: {self.base_dir_name}")
-            self.tree.delete(*self.tree.get_children())
-            self.checked_items.clear()
-            self.file_utils.load_gitignore()
-            self.treeview_utils.populate_tree('', self.base_path)
-            self.treeview_utils.update_status()
+        """Opens a directory selection dialog and replaces the workspace with it."""
+        path = filedialog.askdirectory()
+        if path:
+            for root in list(self.roots):
+                self.remove_root(root)
+            self.add_root(path)
+
+    def add_directory(self):
+        """Opens a directory selection dialog and adds it to the workspace."""
+        path = filedialog.askdirectory()
+        if path:
+            self.add_root(path)
+
+    def add_root(self, path: str):
+        """
+        Adds a directory to the workspace and populates its subtree.
+
+        Args:
+            path: The path of the directory to add.
+        """
+        root = WorkspaceRoot(path)
+        conflict = find_conflict(self.roots, root)
+        if conflict:
+            self.status_label.config(text=conflict)
+            return
+
+        self.roots.append(root)
+        self.update_dir_label()
+        self.treeview_utils.refresh_tree([root])
+        self.menu_bar.update_presets_menu()
+
+    def remove_root(self, root: WorkspaceRoot):
+        """
+        Removes a directory from the workspace.
+
+        Args:
+            root: The workspace root to remove.
+        """
+        self.roots.remove(root)
+        self.treeview_utils.remove_root(root)
+        self.update_dir_label()
+        self.menu_bar.update_presets_menu()
+
+    def update_dir_label(self):
+        """Updates the directory label with the names of the workspace roots."""
+        if self.roots:
+            names = ", ".join(root.name for root in self.roots)
+            self.dir_label.config(text=f"Selected: {names}")
+        else:
+            self.dir_label.config(text="No directory selected")
+
+    def restore_session(self, on_done: Optional[Callable[[], None]] = None):
+        """
+        Restores the roots, expanded folders and selection of the previous session.
+
+        The roots are scanned in a worker thread so the window stays responsive.
+        Refreshes and preset actions requested meanwhile run once it finishes.
+
+        Args:
+            on_done: Called once the restored tree has been populated.
+        """
+        session = load_session()
+        self.show_hidden.set(session.get('show_hidden', self.show_hidden.get()))
+        self.use_gitignore.set(session.get('use_gitignore', self.use_gitignore.get()))
+
+        for path in session.get('roots', []):
+            root = WorkspaceRoot(path)
+            if os.path.isdir(root.path) and not find_conflict(self.roots, root):
+                self.roots.append(root)
+        if not self.roots:
+            if on_done:
+                on_done()
+            return
+
+        def _done():
+            self.pending_session = None
+            callbacks, self.after_restore = self.after_restore, []
+            for callback in callbacks:
+                callback()
+            if on_done:
+                on_done()
+
+        self.pending_session = session
+        self.update_dir_label()
+        self.menu_bar.update_presets_menu()
+        self.status_label.config(text="Loading previous session...")
+        self.treeview_utils.refresh_tree_async(
+            state={
+                'opened': set(session.get('opened', [])),
+                'checked_paths': set(session.get('checked', []))
+            },
+            on_done=_done
+        )
+
+    def defer_until_restored(self, callback: Callable[[], None]) -> bool:
+        """
+        Queues an action until the previous session has been restored.
+
+        Args:
+            callback: The action to run once the restore finishes.
+
+        Returns:
+            True if the action was queued, False if no restore is in progress.
+        """
+        if self.pending_session is None:
+            return False
+        self.after_restore.append(callback)
+        return True
+
+    def on_close(self):
+        """Saves the session and closes the application."""
+        if self.pending_session is not None:
+            # The tree is still incomplete, so keep the previous session as it was
+            save_session(self.pending_session)
+            self.root.destroy()
+            return
+
+        state = self.treeview_utils.save_tree_state()
+        save_session({
+            'roots': [root.path for root in self.roots],
+            'opened': sorted(state['opened']),
+            'checked': sorted(state['checked_paths']),
+            'show_hidden': self.show_hidden.get(),
+            'use_gitignore': self.use_gitignore.get()
+        })
+        self.root.destroy()
+
+    def get_preset_names(self) -> List[str]:
+        """
+        Returns the names of the presets stored in the workspace roots.
+
+        Returns:
+            The sorted preset names.
+        """
+        names = set()
+        for root in self.roots:
+            try:
+                names.update(load_presets(root.path))
+            except (OSError, ValueError) as e:
+                self.status_label.config(text=f"Error loading presets: {e}")
+        return sorted(names)
+
+    def apply_preset(self, name: str):
+        """
+        Checks the files selected by a preset in every root that defines it.
+
+        Args:
+            name: The name of the preset.
+        """
+        if self.defer_until_restored(lambda: self.apply_preset(name)):
+            return
+        self.treeview_utils.refresh_tree()
+        try:
+            paths = evaluate_preset(self.roots, name)
+        except KeyError:
+            self.status_label.config(text=f"Preset {name} not found")
+            return
+        except (OSError, ValueError) as e:
+            self.status_label.config(text=f"Error loading presets: {e}")
+            return
+        self.treeview_utils.set_checked_items(paths)
+
+    def save_preset(self, name: str, include: List[str], exclude: List[str]):
+        """
+        Saves a preset in every workspace root, pinning the checked files of each root.
+
+        Args:
+            name: The name of the preset.
+            include: Glob patterns of files to select.
+            exclude: Glob patterns of files to leave out.
+        """
+        # The checked files are only known once the session is restored
+        if self.defer_until_restored(lambda: self.save_preset(name, include, exclude)):
+            return
+        try:
+            for root in self.roots:
+                pinned = sorted(
+                    root.relative_path(item) for item in self.checked_items if root.contains(item)
+                )
+                save_preset(root.path, SelectionPreset(name, include, exclude, pinned))
+        except (OSError, ValueError) as e:
+            self.status_label.config(text=f"Error saving preset: {e}")
+            return
+        self.menu_bar.update_presets_menu()
+        self.status_label.config(text=f"Saved preset {name}")
+
+    def show_root_menu(self, event):
+        """
+        Shows the context menu when a workspace root is right-clicked.
+
+        Args:
+            event: The event object.
+        """
+        item = self.tree.identify('item', event.x, event.y)
+        self.context_root = find_root(self.roots, item) if item else None
+        if self.context_root and self.context_root.path == item:
+            self.root_menu.tk_popup(event.x_root, event.y_root)
+
+    def refresh_context_root(self):
+        """Rescans the workspace root the context menu was opened on."""
+        if self.context_root in self.roots:
+            self.treeview_utils.refresh_tree([self.context_root], force=True)
+
+    def remove_context_root(self):
+        """Removes the workspace root the context menu was opened on."""
+        if self.context_root in self.roots:
+            self.remove_root(self.context_root)
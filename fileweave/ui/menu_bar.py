@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk
 
 from fileweave.ui.about_dialog import AboutDialog
+from fileweave.ui.preset_dialog import PresetDialog
 from fileweave.constants import APP_TITLE
 
 class MenuBar:
@@ -29,15 +30,29 @@ class MenuBar:
             command=self.main_window.select_directory,
             accelerator="⌘O" if tk.TkVersion >= 8.6 else "Ctrl+O"
         )
+        file_menu.add_command(
+            label="Add Directory...",
+            command=self.main_window.add_directory
+        )
+        file_menu.add_command(
+            label="Refresh",
+            command=lambda: self.main_window.treeview_utils.refresh_tree(),
+            accelerator="⌘R" if tk.TkVersion >= 8.6 else "F5"
+        )
         file_menu.add_command(
             label="Copy Output",
             command=self.main_window.file_utils.copy_to_clipboard,
             accelerator="⌘C" if tk.TkVersion >= 8.6 else "Ctrl+C"
         )
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.main_window.on_close)
         menubar.add_cascade(label="File", menu=file_menu)
 
+        # Presets menu, rebuilt whenever the workspace changes
+        self.presets_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Presets", menu=self.presets_menu)
+        self.update_presets_menu()
+
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
         help_menu.add_command(label="About", command=self.show_about)
@@ -45,6 +60,30 @@ class MenuBar:
 
         self.root.config(menu=menubar)
 
+    def update_presets_menu(self):
+        """
+        Rebuilds the Presets menu from the presets stored in the workspace roots.
+        """
+        self.presets_menu.delete(0, tk.END)
+        for name in self.main_window.get_preset_names():
+            self.presets_menu.add_command(
+                label=name,
+                command=lambda name=name: self.main_window.apply_preset(name)
+            )
+        if self.presets_menu.index(tk.END) is not None:
+            self.presets_menu.add_separator()
+        self.presets_menu.add_command(
+            label="Save Selection as Preset...",
+            command=self.show_preset_dialog,
+            state=tk.NORMAL if self.main_window.roots else tk.DISABLED
+        )
+
+    def show_preset_dialog(self):
+        """
+        Displays the dialog for saving a preset.
+        """
+        PresetDialog(self.root, self.main_window)
+
     def show_about(self):
         """
         Displays the About dialog.
@@ -0,0 +1,81 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import List
+
+class PresetDialog:
+    """
+    Dialog for saving the current selection as a named preset.
+    """
+
+    def __init__(self, root: tk.Tk, main_window: "MainWindow"):
+        """
+        Initializes the preset dialog.
+
+        Args:
+            root: The root Tkinter window.
+            main_window: The main window instance.
+        """
+        self.root = root
+        self.main_window = main_window
+        self.preset_window = tk.Toplevel(self.root)
+        self.preset_window.title("Save Preset")
+        self.preset_window.geometry("420x380")
+        self.preset_window.transient(self.root)
+
+        preset_frame = ttk.Frame(self.preset_window, padding="20")
+        preset_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.preset_window.columnconfigure(0, weight=1)
+        self.preset_window.rowconfigure(0, weight=1)
+        preset_frame.columnconfigure(0, weight=1)
+
+        ttk.Label(preset_frame, text="Name").grid(row=0, column=0, sticky=tk.W)
+        self.name_entry = ttk.Entry(preset_frame)
+        self.name_entry.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+
+        ttk.Label(preset_frame, text="Include patterns (one per line)").grid(row=2, column=0, sticky=tk.W)
+        self.include_text = tk.Text(preset_frame, height=5)
+        self.include_text.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+
+        ttk.Label(preset_frame, text="Exclude patterns (one per line)").grid(row=4, column=0, sticky=tk.W)
+        self.exclude_text = tk.Text(preset_frame, height=5)
+        self.exclude_text.grid(row=5, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        preset_frame.rowconfigure(3, weight=1)
+        preset_frame.rowconfigure(5, weight=1)
+
+        ttk.Label(
+            preset_frame,
+            text="Checked files are saved as pinned paths.",
+            style="Subtitle.TLabel"
+        ).grid(row=6, column=0, sticky=tk.W, pady=(0, 10))
+
+        ttk.Button(
+            preset_frame,
+            text="Save",
+            command=self.save
+        ).grid(row=7, column=0, sticky=tk.E)
+
+        self.name_entry.focus_set()
+
+    def save(self):
+        """Saves the preset and closes the dialog."""
+        name = self.name_entry.get().strip()
+        if not name:
+            return
+
+        include = self.get_patterns(self.include_text)
+        exclude = self.get_patterns(self.exclude_text)
+        self.main_window.save_preset(name, include, exclude)
+        self.preset_window.destroy()
+
+    @staticmethod
+    def get_patterns(text: tk.Text) -> List[str]:
+        """
+        Returns the non-empty lines of a text widget.
+
+        Args:
+            text: The text widget.
+
+        Returns:
+            One pattern per line, without surrounding whitespace.
+        """
+        return [line.strip() for line in text.get(1.0, tk.END).splitlines() if line.strip()]
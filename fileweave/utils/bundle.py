@@ -0,0 +1,107 @@
+import os
+import threading
+from typing import Dict, Set, Tuple
+
+from fileweave.utils.workspace import WorkspaceRoot
+
+CODE_EXTENSIONS = ['.py', '.java', '.js', '.cpp', '.c']
+
+def get_language(path: str) -> str:
+    """
+    Returns the code block language identifier for a file.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        The language identifier.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in CODE_EXTENSIONS:
+        return ext[1:]
+    return 'text'
+
+def format_file_block(root: WorkspaceRoot, path: str, content: str) -> str:
+    """
+    Formats a file as a markdown code block with a root-prefixed header.
+
+    Args:
+        root: The workspace root the file belongs to.
+        path: The full path of the file.
+        content: The content of the file.
+
+    Returns:
+        The formatted block.
+    """
+    return (
+        f"```{get_language(path)}\n"
+        f"# {root.name}/{root.relative_path(path)}\n"
+        f"{content}\n"
+        "```\n\n"
+    )
+
+class BundleCache:
+    """
+    Thread-safe cache of rendered file blocks, invalidated by file size and mtime.
+    """
+
+    def __init__(self):
+        """
+        Initializes the BundleCache class.
+        """
+        self._blocks: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def render(self, root: WorkspaceRoot, path: str) -> str:
+        """
+        Renders a file block, reading the file only if it changed since the last call.
+
+        Args:
+            root: The workspace root the file belongs to.
+            path: The full path of the file.
+
+        Returns:
+            The formatted block, or an error line if the file could not be read.
+        """
+        try:
+            stat = os.stat(path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            with self._lock:
+                cached = self._blocks.get(path)
+            if cached and cached[0] == stamp:
+                return cached[1]
+
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            with self._lock:
+                self._blocks.pop(path, None)
+            return f"Error reading {root.relative_path(path)}: {str(e)}\n\n"
+
+        block = format_file_block(root, path, content)
+        with self._lock:
+            self._blocks[path] = (stamp, block)
+        return block
+
+    def prune(self, root: WorkspaceRoot, paths: Set[str]):
+        """
+        Drops the cached blocks of a root whose file is no longer in a set of paths.
+
+        Args:
+            root: The workspace root.
+            paths: The paths that may stay cached, usually the root's indexed files.
+        """
+        with self._lock:
+            for path in [path for path in self._blocks if root.contains(path) and path not in paths]:
+                del self._blocks[path]
+
+    def discard(self, root: WorkspaceRoot):
+        """
+        Drops every cached block that belongs to a workspace root.
+
+        Args:
+            root: The workspace root.
+        """
+        with self._lock:
+            for path in [path for path in self._blocks if root.contains(path)]:
+                del self._blocks[path]
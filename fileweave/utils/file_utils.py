@@ -1,8 +1,9 @@
 import os
-from typing import Optional
-import pathspec
 import tkinter as tk
 
+from fileweave.utils.bundle import BundleCache
+from fileweave.utils.workspace import find_root
+
 class FileUtils:
     """
     Utility class for file operations in the FileWeave application.
@@ -16,85 +17,46 @@ class FileUtils:
             main_window: The main window instance.
         """
         self.main_window = main_window
-        self.gitignore_spec: Optional[pathspec.PathSpec] = None
-
-    def load_gitignore(self):
-        """Loads the .gitignore file if present and enabled."""
-        self.gitignore_spec = None
-        if self.main_window.use_gitignore.get() and self.main_window.base_path:
-            gitignore_path = os.path.join(self.main_window.base_path, '.gitignore')
-            if os.path.exists(gitignore_path):
-                try:
-                    with open(gitignore_path, 'r', encoding='utf-8') as f:
-                        spec = pathspec.PathSpec.from_lines('gitwildmatch', f)
-                    self.gitignore_spec = spec
-                except Exception:
-                    pass
-
-    def should_show_item(self, path: str, name: str) -> bool:
-        """
-        Determines whether an item should be shown in the treeview based on .gitignore and hidden file settings.
-
-        Args:
-            path: The path of the item.
-            name: The name of the item.
-
-        Returns:
-            True if the item should be shown, False otherwise.
-        """
-        if name.startswith('.') and not self.main_window.show_hidden.get():
-            return False
-
-        if self.gitignore_spec and self.main_window.use_gitignore.get():
-            full_path = os.path.join(path, name)
-            relative_path = os.path.relpath(full_path, self.main_window.base_path)
-            relative_path = relative_path.replace(os.sep, '/')
-            if self.gitignore_spec.match_file(relative_path):
-                return False
-
-            if os.path.isdir(full_path):
-                dir_pattern = relative_path + '/**'
-                if self.gitignore_spec.match_file(dir_pattern):
-                    return False
-
-        return True
+        self.bundle_cache = BundleCache()
 
     def generate_output(self):
         """Generates the output text by concatenating selected files."""
         self.main_window.output_text.delete(1.0, tk.END)
 
-        if not self.main_window.base_path:
+        if not self.main_window.roots:
             self.main_window.output_text.insert(tk.END, "No directory selected.\n")
             return
 
-        for item_id in self.main_window.checked_items:
+        # Group files by root, in the order the roots were added, skipping
+        # checked items that no longer belong to any root
+        roots = self.main_window.roots
+        owners = {item: find_root(roots, item) for item in self.main_window.checked_items}
+        ordered_items = sorted(
+            (item for item, root in owners.items() if root is not None and os.path.isfile(item)),
+            key=lambda item: (roots.index(owners[item]), item)
+        )
+
+        if self.main_window.daemon_client:
+            from fileweave.daemon.client import DaemonError
+
+            try:
+                root_paths = [root.path for root in roots]
+                self.main_window.daemon_client.add_roots(root_paths)
+                blocks = self.main_window.daemon_client.bundle(
+                    roots=root_paths,
+                    paths=ordered_items
+                )
+                for block in blocks:
+                    self.main_window.output_text.insert(tk.END, block)
+                self.main_window.status_label.config(text="Output generated by daemon")
+                return
+            except (DaemonError, OSError):
+                # Fall back to reading the files locally
+                self.main_window.output_text.delete(1.0, tk.END)
+
+        for item_id in ordered_items:
             # Use item_id directly as it's already the full path
-            if os.path.isfile(item_id):
-                try:
-                    with open(item_id, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    # Extract relative path for display purposes
-                    relative_path = os.path.relpath(item_id, self.main_window.base_path)
-
-                    ext = os.path.splitext(item_id)[1].lower()
-                    if ext in ['.py', '.java', '.js', '.cpp', '.c']:
-                        language = ext[1:]
-                    else:
-                        language = 'text'
-
-                    self.main_window.output_text.insert(tk.END, f"```{language}\n")
-                    self.main_window.output_text.insert(
-                        tk.END,
-                        f"# {self.main_window.base_dir_name}/{relative_path}\n"
-                    )
-                    self.main_window.output_text.insert(tk.END, f"{content}\n")
-                    self.main_window.output_text.insert(tk.END, "```\n\n")
-                except Exception as e:
-                    self.main_window.output_text.insert(
-                        tk.END,
-                        f"Error reading {relative_path}: {str(e)}\n\n"
-                    )
+            self.main_window.output_text.insert(tk.END, self.bundle_cache.render(owners[item_id], item_id))
 
         self.main_window.status_label.config(text="Output generated")
 
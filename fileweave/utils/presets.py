@@ -0,0 +1,214 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+from fileweave.constants import PRESETS_FILE, PROJECT_CONFIG_DIR
+from fileweave.utils.workspace import WorkspaceRoot, compile_patterns
+
+class SelectionPreset:
+    """
+    A named selection made of include/exclude glob rules and pinned paths.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        pinned: Optional[List[str]] = None
+    ):
+        """
+        Initializes the SelectionPreset class.
+
+        Args:
+            name: The name of the preset.
+            include: Glob patterns of files to select, relative to the root.
+            exclude: Glob patterns of files to leave out, even if included.
+            pinned: Relative paths of files that are always selected. Paths that
+                are not in the root's index are ignored.
+        """
+        self.name = name
+        self.include = include or []
+        self.exclude = exclude or []
+        self.pinned = pinned or []
+
+    def evaluate(self, root: WorkspaceRoot) -> List[str]:
+        """
+        Evaluates the preset against the cached scan of a root.
+
+        The rules are compiled into a single spec, in which exclude patterns
+        are negated, and matched against the root's file index in one pass.
+
+        Args:
+            root: The workspace root.
+
+        Returns:
+            The full paths of the selected files.
+        """
+        selected = []
+        if self.include:
+            spec = compile_patterns(self.include + ['!' + pattern for pattern in self.exclude])
+            selected = root.match_files(spec)
+
+        # Pinned paths come from a file in the project, so only accept files
+        # the root's index already shows: nothing hidden, ignored or outside it
+        indexed = set(root.files())
+        seen = set(selected)
+        for relative_path in self.pinned:
+            path = os.path.normpath(os.path.join(root.path, *relative_path.split('/')))
+            if path in indexed and path not in seen:
+                selected.append(path)
+                seen.add(path)
+        return selected
+
+    def to_dict(self) -> Dict:
+        """
+        Returns the preset as a JSON-serializable dictionary.
+
+        Returns:
+            The preset rules, without the name.
+        """
+        return {'include': self.include, 'exclude': self.exclude, 'pinned': self.pinned}
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict) -> "SelectionPreset":
+        """
+        Creates a preset from a dictionary written by to_dict.
+
+        Args:
+            name: The name of the preset.
+            data: The preset rules.
+
+        Returns:
+            The preset.
+
+        Raises:
+            ValueError: If the rules are malformed.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Preset {name} must be an object")
+        rules = {}
+        for key in ('include', 'exclude', 'pinned'):
+            value = data.get(key) or []
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError(f"Preset {name}: '{key}' must be a list of strings")
+            rules[key] = value
+        return cls(name, rules['include'], rules['exclude'], rules['pinned'])
+
+def get_presets_path(root_path: str) -> str:
+    """
+    Returns the path of a project's presets file.
+
+    Args:
+        root_path: The project root directory.
+
+    Returns:
+        The path of the presets file.
+    """
+    return os.path.join(root_path, PROJECT_CONFIG_DIR, PRESETS_FILE)
+
+def read_presets_file(root_path: str) -> Dict:
+    """
+    Reads a project's presets file without interpreting the presets.
+
+    Args:
+        root_path: The project root directory.
+
+    Returns:
+        The file contents, empty if the file does not exist.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid presets file.
+    """
+    path = get_presets_path(root_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        raise ValueError(f"Invalid presets file {path}: {e}") from None
+
+    if not isinstance(data, dict) or not isinstance(data.get('presets', {}), dict):
+        raise ValueError(f"Invalid presets file {path}: 'presets' must be an object")
+    return data
+
+def load_presets(root_path: str) -> Dict[str, SelectionPreset]:
+    """
+    Loads the presets stored in a project.
+
+    Malformed presets are skipped so they don't hide the valid ones.
+
+    Args:
+        root_path: The project root directory.
+
+    Returns:
+        The presets by name, empty if the file does not exist.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid presets file.
+    """
+    presets = {}
+    for name, rules in read_presets_file(root_path).get('presets', {}).items():
+        try:
+            presets[name] = SelectionPreset.from_dict(name, rules)
+        except ValueError:
+            continue
+    return presets
+
+def save_preset(root_path: str, preset: SelectionPreset):
+    """
+    Adds or replaces a preset in a project's presets file.
+
+    Every other entry in the file is kept as it is. A file that cannot be
+    parsed is never overwritten.
+
+    Args:
+        root_path: The project root directory.
+        preset: The preset to save.
+
+    Raises:
+        OSError: If the file cannot be read or written.
+        ValueError: If the existing file is not a valid presets file.
+    """
+    data = read_presets_file(root_path)
+    presets = dict(data.get('presets', {}))
+    presets[preset.name] = preset.to_dict()
+    data['presets'] = {name: presets[name] for name in sorted(presets)}
+
+    path = get_presets_path(root_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+    os.replace(temp_path, path)
+
+def evaluate_preset(roots: List[WorkspaceRoot], name: str) -> List[str]:
+    """
+    Evaluates a preset in every root that defines it.
+
+    Args:
+        roots: The workspace roots.
+        name: The name of the preset.
+
+    Returns:
+        The full paths of the selected files.
+
+    Raises:
+        KeyError: If no root defines the preset.
+        OSError: If a presets file cannot be read.
+        ValueError: If a presets file is not valid.
+    """
+    selected = []
+    found = False
+    for root in roots:
+        preset = load_presets(root.path).get(name)
+        if preset:
+            found = True
+            selected.extend(preset.evaluate(root))
+    if not found:
+        raise KeyError(name)
+    return selected
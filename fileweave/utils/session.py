@@ -0,0 +1,54 @@
+import json
+import os
+from typing import Dict
+
+from fileweave.constants import SESSION_FILE
+
+SESSION_LISTS = ('roots', 'opened', 'checked')
+SESSION_FLAGS = ('show_hidden', 'use_gitignore')
+
+def load_session(path: str = SESSION_FILE) -> Dict:
+    """
+    Loads the state saved at the end of the previous session.
+
+    Entries of the wrong type are discarded, so a damaged file restores
+    whatever is still valid in it.
+
+    Args:
+        path: The path of the session file.
+
+    Returns:
+        The session state, empty if the file is missing or unreadable.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    session = {}
+    for key in SESSION_LISTS:
+        value = data.get(key)
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            session[key] = value
+    for key in SESSION_FLAGS:
+        if isinstance(data.get(key), bool):
+            session[key] = data[key]
+    return session
+
+def save_session(session: Dict, path: str = SESSION_FILE):
+    """
+    Saves the session state so the next launch can restore it.
+
+    Args:
+        session: The session state.
+        path: The path of the session file.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(session, f, indent=2)
+    except OSError:
+        pass
@@ -1,7 +1,10 @@
 import os
-from typing import Dict, List, Set
+import queue
+import threading
+from typing import Callable, Dict, List, Optional
 
 from fileweave.constants import ICONS
+from fileweave.utils.workspace import WorkspaceRoot, scan_roots
 
 class TreeViewUtils:
     """
@@ -42,13 +45,13 @@ class TreeViewUtils:
             A dictionary containing the saved state.
         """
         state = {
-            'opened': [],
-            'checked_paths': []
+            'opened': set(),
+            'checked_paths': set()
         }
 
         def _save_open_state(item):
             if self.main_window.tree.item(item)['open']:
-                state['opened'].append(self.main_window.tree.item(item)['text'])
+                state['opened'].add(item)
                 for child in self.main_window.tree.get_children(item):
                     _save_open_state(child)
 
@@ -57,20 +60,20 @@ class TreeViewUtils:
 
         for item in self.main_window.checked_items:
             if os.path.exists(item):
-                state['checked_paths'].append(item)
+                state['checked_paths'].add(item)
 
         return state
 
-    def restore_tree_state(self, state: Dict):
+    def restore_tree_state(self, state: Dict, parent: str = ''):
         """
         Restores the saved state of opened folders and checked items in the treeview.
 
         Args:
             state: The saved state dictionary.
+            parent: The item whose subtree should be restored, the whole tree by default.
         """
         def _restore_state(item):
-            item_text = self.main_window.tree.item(item)['text']
-            if item_text in state['opened']:
+            if item in state['opened']:
                 self.main_window.tree.item(item, open=True)
             if item in state['checked_paths']:
                 self.main_window.tree.item(item, tags=('checked',))
@@ -78,19 +81,131 @@ class TreeViewUtils:
             for child in self.main_window.tree.get_children(item):
                 _restore_state(child)
 
-        for item in self.main_window.tree.get_children(''):
+        for item in self.main_window.tree.get_children(parent):
             _restore_state(item)
 
-    def refresh_tree(self):
-        """Refreshes the treeview, reloading its contents."""
-        if self.main_window.base_path:
+    def refresh_tree(
+        self,
+        roots: Optional[List[WorkspaceRoot]] = None,
+        force: bool = False,
+        state: Optional[Dict] = None
+    ):
+        """
+        Refreshes the treeview, reloading only the roots that changed on disk.
+
+        While the previous session is being restored, the refresh is queued
+        until the restore finishes.
+
+        Args:
+            roots: The roots to refresh, all workspace roots by default.
+            force: Rescan the roots even if their cached scan is still valid.
+            state: The tree state to restore, the current one by default.
+        """
+        if self.main_window.defer_until_restored(lambda: self.refresh_tree(roots, force, state)):
+            return
+        if roots is None:
+            roots = self.main_window.roots
+        # A queued refresh may name a root that was removed in the meantime
+        roots = [root for root in roots if root in self.main_window.roots]
+        if not roots:
+            return
+
+        if state is None:
+            state = self.save_tree_state()
+        rescanned = scan_roots(
+            roots,
+            self.main_window.show_hidden.get(),
+            self.main_window.use_gitignore.get(),
+            force
+        )
+        for root in rescanned:
+            self.reload_root(root, state)
+        self.update_status()
+
+    def refresh_tree_async(self, state: Optional[Dict] = None, on_done: Optional[Callable[[], None]] = None):
+        """
+        Rescans the workspace roots in a worker thread, then reloads them in the treeview.
+
+        The treeview is only touched from the Tk thread, which polls for the
+        scan result so the window stays responsive while large trees are scanned.
+
+        Args:
+            state: The tree state to restore, the current one by default.
+            on_done: Called on the Tk thread once the tree has been reloaded.
+        """
+        roots = list(self.main_window.roots)
+        if state is None:
             state = self.save_tree_state()
-            self.main_window.tree.delete(*self.main_window.tree.get_children())
-            self.main_window.checked_items.clear()
-            self.main_window.file_utils.load_gitignore()
-            self.populate_tree('', self.main_window.base_path)
-            self.restore_tree_state(state)
+        show_hidden = self.main_window.show_hidden.get()
+        use_gitignore = self.main_window.use_gitignore.get()
+        results: "queue.Queue[List[WorkspaceRoot]]" = queue.Queue()
+
+        def _scan():
+            rescanned = []
+            try:
+                rescanned = scan_roots(roots, show_hidden, use_gitignore)
+            finally:
+                results.put(rescanned)
+
+        def _poll():
+            try:
+                rescanned = results.get_nowait()
+            except queue.Empty:
+                self.main_window.root.after(50, _poll)
+                return
+            for root in rescanned:
+                # The root may have been removed while it was being scanned
+                if root in self.main_window.roots:
+                    self.reload_root(root, state)
             self.update_status()
+            if on_done:
+                on_done()
+
+        threading.Thread(target=_scan, daemon=True).start()
+        self.main_window.root.after(50, _poll)
+
+    def reload_root(self, root: WorkspaceRoot, state: Optional[Dict] = None):
+        """
+        Rebuilds the subtree of a workspace root from its cached scan.
+
+        Args:
+            root: The workspace root.
+            state: The saved tree state to restore, if any.
+        """
+        tree = self.main_window.tree
+        if tree.exists(root.path):
+            tree.delete(*tree.get_children(root.path))
+        else:
+            tree.insert(
+                '',
+                self.main_window.roots.index(root),
+                root.path,
+                text=f"{ICONS['folder']} {root.name}",
+                open=True,
+                tags=('folder', 'root')
+            )
+
+        self.main_window.checked_items.difference_update(
+            [item for item in self.main_window.checked_items if root.contains(item)]
+        )
+        self.populate_tree(root)
+        if state:
+            self.restore_tree_state(state, root.path)
+
+    def remove_root(self, root: WorkspaceRoot):
+        """
+        Removes a workspace root and its subtree from the treeview.
+
+        Args:
+            root: The workspace root.
+        """
+        if self.main_window.tree.exists(root.path):
+            self.main_window.tree.delete(root.path)
+        self.main_window.file_utils.bundle_cache.discard(root)
+        self.main_window.checked_items.difference_update(
+            [item for item in self.main_window.checked_items if root.contains(item)]
+        )
+        self.update_status()
 
     def toggle_check(self, event):
         """
@@ -109,6 +224,24 @@ class TreeViewUtils:
                 self.main_window.checked_items.add(item)
             self.update_status()
 
+    def set_checked_items(self, paths: List[str]):
+        """
+        Replaces the checked items, retagging only the items whose state changed.
+
+        Args:
+            paths: The full paths of the files to check.
+        """
+        tree = self.main_window.tree
+        checked = set(paths)
+        for item in self.main_window.checked_items - checked:
+            if tree.exists(item):
+                tree.item(item, tags=())
+        for item in checked - self.main_window.checked_items:
+            if tree.exists(item):
+                tree.item(item, tags=('checked',))
+        self.main_window.checked_items = checked
+        self.update_status()
+
     def update_status(self):
         """Updates the status label with the number of selected files."""
         num_selected = len(self.main_window.checked_items)
@@ -116,21 +249,17 @@ class TreeViewUtils:
             text=f"{num_selected} file{'s' if num_selected != 1 else ''} selected"
         )
 
-    def populate_tree(self, parent: str, path: str):
+    def populate_tree(self, root: WorkspaceRoot):
         """
-        Populates the treeview with the contents of a directory.
+        Populates the treeview with the cached contents of a workspace root.
 
         Args:
-            parent: The parent item ID.
-            path: The path of the directory to populate.
+            root: The workspace root to populate.
         """
-        for item in sorted(os.listdir(path)):
-            if not self.main_window.file_utils.should_show_item(path, item):
-                continue
+        for parent, item, is_dir in root.entries:
+            item_path = os.path.join(parent, item)
 
-            item_path = os.path.join(path, item)
-
-            if os.path.isfile(item_path):
+            if not is_dir:
                 ext = os.path.splitext(item)[1].lower()
                 icon = ICONS.get(ext, ICONS['file'])
                 if item.upper() in ['README.MD', 'LICENSE', '.GITIGNORE']:
@@ -138,13 +267,10 @@ class TreeViewUtils:
             else:
                 icon = ICONS['folder']
 
-            node = self.main_window.tree.insert(
+            self.main_window.tree.insert(
                 parent,
                 'end',
                 item_path,
                 text=f"{icon} {item}",
-                tags=('file',) if os.path.isfile(item_path) else ('folder',)
+                tags=('folder',) if is_dir else ('file',)
             )
-
-            if os.path.isdir(item_path):
-                self.populate_tree(node, item_path)
@@ -0,0 +1,262 @@
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pathspec
+
+class WorkspaceRoot:
+    """
+    A directory added to the workspace, with its own ignore rules and scan cache.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the workspace root.
+
+        Args:
+            path: The path of the root directory.
+        """
+        self.path = os.path.abspath(path)
+        self.name = os.path.basename(self.path) or self.path
+        self.gitignore_spec: Optional["pathspec.PathSpec"] = None
+        # (parent_path, name, is_dir) in tree order, parents before children
+        self.entries: List[Tuple[str, str, bool]] = []
+        self._signature: Dict[str, int] = {}
+        self._options: Optional[Tuple[bool, bool]] = None
+
+    def contains(self, path: str) -> bool:
+        """
+        Checks whether a path is the root itself or lies inside it.
+
+        Args:
+            path: The path to check.
+
+        Returns:
+            True if the path belongs to this root, False otherwise.
+        """
+        path = os.path.abspath(path)
+        return path == self.path or path.startswith(self.path.rstrip(os.sep) + os.sep)
+
+    def relative_path(self, path: str) -> str:
+        """
+        Returns the path relative to the root, using forward slashes.
+
+        Args:
+            path: A path inside the root.
+
+        Returns:
+            The relative path.
+        """
+        return os.path.relpath(path, self.path).replace(os.sep, '/')
+
+    def load_gitignore(self, use_gitignore: bool):
+        """
+        Loads the root's .gitignore file if present and enabled.
+
+        Args:
+            use_gitignore: Whether .gitignore rules should be respected.
+        """
+        self.gitignore_spec = None
+        if use_gitignore:
+            gitignore_path = os.path.join(self.path, '.gitignore')
+            if os.path.exists(gitignore_path):
+                try:
+                    with open(gitignore_path, 'r', encoding='utf-8') as f:
+                        self.gitignore_spec = compile_patterns(f)
+                except Exception:
+                    pass
+
+    def should_show_item(self, full_path: str, name: str, is_dir: bool, show_hidden: bool) -> bool:
+        """
+        Determines whether an item should be shown based on .gitignore and hidden file settings.
+
+        Args:
+            full_path: The full path of the item.
+            name: The name of the item.
+            is_dir: Whether the item is a directory.
+            show_hidden: Whether hidden files should be shown.
+
+        Returns:
+            True if the item should be shown, False otherwise.
+        """
+        if name.startswith('.') and not show_hidden:
+            return False
+
+        if self.gitignore_spec:
+            relative_path = self.relative_path(full_path)
+            if self.gitignore_spec.match_file(relative_path):
+                return False
+
+            if is_dir and self.gitignore_spec.match_file(relative_path + '/**'):
+                return False
+
+        return True
+
+    def is_stale(self, show_hidden: bool, use_gitignore: bool) -> bool:
+        """
+        Checks whether the cached scan no longer reflects the directory on disk.
+
+        Only directory and .gitignore modification times are compared, so this
+        is much cheaper than a rescan.
+
+        Args:
+            show_hidden: Whether hidden files should be shown.
+            use_gitignore: Whether .gitignore rules should be respected.
+
+        Returns:
+            True if the root needs to be rescanned, False otherwise.
+        """
+        if self._options != (show_hidden, use_gitignore):
+            return True
+        for path, mtime in self._signature.items():
+            if self._mtime(path) != mtime:
+                return True
+        return False
+
+    def scan(self, show_hidden: bool, use_gitignore: bool):
+        """
+        Walks the root directory and rebuilds the cached entries.
+
+        Args:
+            show_hidden: Whether hidden files should be shown.
+            use_gitignore: Whether .gitignore rules should be respected.
+        """
+        self.load_gitignore(use_gitignore)
+        entries: List[Tuple[str, str, bool]] = []
+        signature = {os.path.join(self.path, '.gitignore'): self._mtime(os.path.join(self.path, '.gitignore'))}
+
+        def _walk(path: str):
+            signature[path] = self._mtime(path)
+            try:
+                with os.scandir(path) as it:
+                    items = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                return
+            for item in items:
+                try:
+                    is_dir = item.is_dir()
+                except OSError:
+                    is_dir = False
+                if not self.should_show_item(item.path, item.name, is_dir, show_hidden):
+                    continue
+                entries.append((path, item.name, is_dir))
+                if is_dir:
+                    _walk(item.path)
+
+        _walk(self.path)
+        self.entries = entries
+        self._signature = signature
+        self._options = (show_hidden, use_gitignore)
+
+    def files(self) -> List[str]:
+        """
+        Returns the full paths of all files in the cached scan.
+
+        Returns:
+            A list of file paths.
+        """
+        return [os.path.join(parent, name) for parent, name, is_dir in self.entries if not is_dir]
+
+    def match_files(self, spec: "pathspec.PathSpec") -> List[str]:
+        """
+        Returns the full paths of the cached files whose relative path matches a spec.
+
+        Args:
+            spec: The compiled glob patterns.
+
+        Returns:
+            A list of matching file paths.
+        """
+        relative_paths = {self.relative_path(path): path for path in self.files()}
+        return [relative_paths[relative_path] for relative_path in spec.match_files(relative_paths)]
+
+    @staticmethod
+    def _mtime(path: str) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return -1
+
+def compile_patterns(patterns: Iterable[str]) -> "pathspec.PathSpec":
+    """
+    Compiles gitignore-style glob patterns into a single spec.
+
+    pathspec is imported on first use to keep it off the startup path.
+
+    Args:
+        patterns: The glob patterns, relative to a root. Patterns starting with '!' exclude.
+
+    Returns:
+        The compiled spec.
+    """
+    import pathspec
+
+    return pathspec.PathSpec.from_lines('gitwildmatch', patterns)
+
+def find_root(roots: Iterable[WorkspaceRoot], path: str) -> Optional[WorkspaceRoot]:
+    """
+    Finds the workspace root that contains a path.
+
+    Args:
+        roots: The workspace roots.
+        path: The path to look up.
+
+    Returns:
+        The owning root, or None if the path is outside every root.
+    """
+    for root in roots:
+        if root.contains(path):
+            return root
+    return None
+
+def find_conflict(roots: Iterable[WorkspaceRoot], root: WorkspaceRoot) -> Optional[str]:
+    """
+    Checks whether a root can be added next to existing ones.
+
+    Roots may not overlap, and their names must be distinct since the name is
+    the path prefix in the output headers.
+
+    Args:
+        roots: The existing workspace roots.
+        root: The root to add.
+
+    Returns:
+        A message describing the conflict, or None if there is none.
+    """
+    for existing in roots:
+        if existing.contains(root.path) or root.contains(existing.path):
+            return f"{root.path} overlaps {existing.path}"
+        if existing.name == root.name:
+            return f"{root.path} has the same name as {existing.path}"
+    return None
+
+def scan_roots(
+    roots: List[WorkspaceRoot],
+    show_hidden: bool,
+    use_gitignore: bool,
+    force: bool = False
+) -> List[WorkspaceRoot]:
+    """
+    Rescans stale workspace roots in parallel.
+
+    concurrent.futures is imported only when several roots need a rescan,
+    which keeps it off the startup path.
+
+    Args:
+        roots: The roots to consider.
+        show_hidden: Whether hidden files should be shown.
+        use_gitignore: Whether .gitignore rules should be respected.
+        force: Rescan every root, even if its cache is still valid.
+
+    Returns:
+        The roots that were rescanned.
+    """
+    stale = [root for root in roots if force or root.is_stale(show_hidden, use_gitignore)]
+    if len(stale) == 1:
+        stale[0].scan(show_hidden, use_gitignore)
+    elif stale:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(len(stale), 8)) as executor:
+            list(executor.map(lambda root: root.scan(show_hidden, use_gitignore), stale))
+    return stale
@@ -0,0 +1,32 @@
+import time
+
+from fileweave.app import StartupProfiler
+
+def test_profiler_records_steps():
+    profiler = StartupProfiler()
+    with profiler.step("import"):
+        pass
+    step_start = time.perf_counter()
+    profiler.record("restore session", step_start)
+
+    assert [label for label, _ in profiler.timings] == ["import", "restore session"]
+    assert all(elapsed >= 0 for _, elapsed in profiler.timings)
+
+def test_profiler_reports_only_when_enabled(capsys):
+    profiler = StartupProfiler()
+    with profiler.step("import"):
+        pass
+    profiler.report()
+    assert capsys.readouterr().err == ""
+
+    profiler.enabled = True
+    profiler.report()
+    lines = capsys.readouterr().err.splitlines()
+    assert [line.split()[0] for line in lines] == ["import", "total"]
+    assert all(line.endswith(" ms") for line in lines)
+
+def test_profiler_total_starts_at_given_time(capsys):
+    profiler = StartupProfiler(enabled=True, start=time.perf_counter() - 1)
+    profiler.report()
+    total = float(capsys.readouterr().err.split()[1])
+    assert total >= 1000
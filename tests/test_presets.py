@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from fileweave.utils.presets import (
+    SelectionPreset,
+    evaluate_preset,
+    get_presets_path,
+    load_presets,
+    save_preset,
+)
+from fileweave.utils.workspace import WorkspaceRoot
+
+@pytest.fixture
+def root(tmp_path):
+    for relative_path in [
+        'project/src/app.py',
+        'project/src/util.py',
+        'project/src/tests/test_app.py',
+        'project/docs/My File.md',
+        'project/README.md',
+        'secret/key.txt',
+    ]:
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('')
+    root = WorkspaceRoot(str(tmp_path / 'project'))
+    root.scan(show_hidden=False, use_gitignore=True)
+    return root
+
+def relative_paths(root, paths):
+    return sorted(root.relative_path(path) for path in paths)
+
+def test_include_and_exclude_rules(root):
+    preset = SelectionPreset('core', include=['*.py'], exclude=['tests/', 'util.py'])
+    assert relative_paths(root, preset.evaluate(root)) == ['src/app.py']
+
+def test_exclude_can_be_reincluded(root):
+    preset = SelectionPreset('core', include=['src/**', '!src/tests/', 'src/tests/test_app.py'])
+    assert relative_paths(root, preset.evaluate(root)) == [
+        'src/app.py', 'src/tests/test_app.py', 'src/util.py'
+    ]
+
+def test_pinned_paths_are_added_once(root):
+    preset = SelectionPreset('docs', include=['*.md'], pinned=['README.md', 'docs/My File.md', 'missing.txt'])
+    assert relative_paths(root, preset.evaluate(root)) == ['README.md', 'docs/My File.md']
+
+def test_pinned_paths_cannot_leave_the_root(root):
+    preset = SelectionPreset('escape', pinned=['../secret/key.txt', 'src/../../secret/key.txt', '.', 'src/app.py'])
+    assert relative_paths(root, preset.evaluate(root)) == ['src/app.py']
+
+def test_save_and_load_round_trip(root):
+    save_preset(root.path, SelectionPreset('a', include=['*.py']))
+    save_preset(root.path, SelectionPreset('b', pinned=['README.md']))
+    presets = load_presets(root.path)
+    assert sorted(presets) == ['a', 'b']
+    assert presets['a'].include == ['*.py']
+    assert presets['b'].pinned == ['README.md']
+
+def test_missing_file_has_no_presets(root):
+    assert load_presets(root.path) == {}
+
+def test_invalid_file_is_reported_and_never_overwritten(root):
+    save_preset(root.path, SelectionPreset('a', include=['*.py']))
+    path = get_presets_path(root.path)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('oops')
+    with open(path, encoding='utf-8') as f:
+        broken = f.read()
+
+    with pytest.raises(ValueError):
+        load_presets(root.path)
+    with pytest.raises(ValueError):
+        save_preset(root.path, SelectionPreset('b'))
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == broken
+
+def test_malformed_preset_does_not_hide_the_others(root):
+    path = get_presets_path(root.path)
+    save_preset(root.path, SelectionPreset('good', include=['*.md']))
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    data['presets']['bad'] = {'include': '*.py'}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    assert list(load_presets(root.path)) == ['good']
+    save_preset(root.path, SelectionPreset('new'))
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['presets']['bad'] == {'include': '*.py'}
+
+def test_evaluate_preset_across_roots(root, tmp_path):
+    other = WorkspaceRoot(str(tmp_path / 'secret'))
+    other.scan(show_hidden=False, use_gitignore=True)
+    save_preset(root.path, SelectionPreset('core', include=['src/*.py']))
+
+    assert relative_paths(root, evaluate_preset([root, other], 'core')) == ['src/app.py', 'src/util.py']
+    with pytest.raises(KeyError):
+        evaluate_preset([root, other], 'missing')
+
+def test_pinned_paths_must_be_indexed(tmp_path):
+    for relative_path in ['src/a.py', '.env', 'build/o.py', '.gitignore']:
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('build/\n' if relative_path == '.gitignore' else '')
+    root = WorkspaceRoot(str(tmp_path))
+    root.scan(show_hidden=False, use_gitignore=True)
+
+    preset = SelectionPreset('leak', pinned=['src/a.py', '.env', 'build/o.py'])
+    assert relative_paths(root, preset.evaluate(root)) == ['src/a.py']
@@ -0,0 +1,40 @@
+import io
+import socket
+
+import pytest
+
+from fileweave.daemon.protocol import parse_address, read_message, read_token, send_message, write_token
+
+def test_parse_unix_socket_address():
+    assert parse_address('unix:fw.sock') == (socket.AF_UNIX, 'fw.sock')
+    assert parse_address('/tmp/fw.sock') == (socket.AF_UNIX, '/tmp/fw.sock')
+
+def test_parse_tcp_address():
+    assert parse_address('47474') == (socket.AF_INET, ('127.0.0.1', 47474))
+    assert parse_address('localhost:8000') == (socket.AF_INET, ('127.0.0.1', 8000))
+    assert parse_address('127.0.0.2:8000') == (socket.AF_INET, ('127.0.0.2', 8000))
+    assert parse_address('[::1]:8000') == (socket.AF_INET6, ('::1', 8000))
+
+@pytest.mark.parametrize('address', ['0.0.0.0:8000', '192.168.1.10:8000', 'example.com:8000', 'abc', 'host:'])
+def test_parse_address_rejects_non_loopback_and_invalid(address):
+    with pytest.raises(ValueError):
+        parse_address(address)
+
+def test_message_round_trip():
+    stream = io.BytesIO()
+    send_message(stream, {'type': 'chunk', 'data': 'a\nb'})
+    stream.seek(0)
+    assert read_message(stream) == {'type': 'chunk', 'data': 'a\nb'}
+    assert read_message(stream) is None
+
+def test_read_message_rejects_non_objects():
+    with pytest.raises(ValueError):
+        read_message(io.BytesIO(b'[1, 2]\n'))
+
+def test_token_file_is_private(tmp_path):
+    path = str(tmp_path / 'config' / 'daemon.token')
+    token = write_token(path)
+    assert read_token(path) == token
+    assert (tmp_path / 'config' / 'daemon.token').stat().st_mode & 0o777 == 0o600
+    assert write_token(path) != token
+    assert read_token(str(tmp_path / 'missing')) is None
@@ -0,0 +1,171 @@
+import socket
+import threading
+
+import pytest
+
+from fileweave.daemon.client import DaemonClient, DaemonError, main as client_main
+from fileweave.daemon.protocol import read_message, send_message
+from fileweave.daemon.server import BundleIndex, close_server, create_server
+from fileweave.utils.presets import SelectionPreset, save_preset
+
+@pytest.fixture
+def workspace(tmp_path):
+    for relative_path, content in {
+        'api/src/app.py': 'app = 1',
+        'api/src/tests/test_app.py': 'test = 1',
+        'api/.gitignore': 'build/\n',
+        'api/build/out.py': 'out = 1',
+        'web/index.js': 'index = 1',
+        'secret/key.txt': 'secret',
+    }.items():
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+@pytest.fixture
+def index(workspace):
+    index = BundleIndex()
+    index.add_roots([str(workspace / 'api'), str(workspace / 'web')])
+    return index
+
+def selected_paths(files):
+    return [f"{root.name}/{root.relative_path(path)}" for root, path in files]
+
+def test_select_paths_and_globs(index, workspace):
+    files = index.select(paths=['web/index.js', str(workspace / 'api' / 'src' / 'app.py')])
+    assert selected_paths(files) == ['api/src/app.py', 'web/index.js']
+
+    files = index.select(globs=['*.py', '!tests/'])
+    assert selected_paths(files) == ['api/src/app.py']
+
+def test_select_restricted_to_roots(index, workspace):
+    files = index.select(roots=[str(workspace / 'web')], globs=['*'])
+    assert selected_paths(files) == ['web/index.js']
+
+@pytest.mark.parametrize('path', [
+    'api/../secret/key.txt',
+    'api/src/../../secret/key.txt',
+    'missing/key.txt',
+    'api/build/out.py',
+])
+def test_select_rejects_paths_outside_the_index(index, workspace, path):
+    with pytest.raises(ValueError):
+        index.select(paths=[path])
+
+def test_select_rejects_absolute_paths_outside_the_index(index, workspace):
+    with pytest.raises(ValueError):
+        index.select(paths=[str(workspace / 'secret' / 'key.txt')])
+    with pytest.raises(ValueError):
+        index.select(paths=[str(workspace / 'api' / '..' / 'secret' / 'key.txt')])
+
+def test_select_does_not_index_unknown_roots(index, workspace):
+    with pytest.raises(ValueError):
+        index.select(roots=['/'])
+    assert [root.name for root in index.get_roots()] == ['api', 'web']
+
+def test_add_roots_is_atomic(index, workspace):
+    (workspace / 'other' / 'api').mkdir(parents=True)
+    with pytest.raises(ValueError):
+        index.add_roots([str(workspace / 'secret'), str(workspace / 'other' / 'api')])
+    assert [root.name for root in index.get_roots()] == ['api', 'web']
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def raw_request(family, address, message):
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.connect(address)
+        with sock.makefile('rwb') as stream:
+            send_message(stream, message)
+            return read_message(stream)
+
+def test_unix_socket_server(index, workspace, tmp_path):
+    address = str(tmp_path / 'fw.sock')
+    server = serve(create_server(address, index))
+    try:
+        assert (tmp_path / 'fw.sock').stat().st_mode & 0o777 == 0o600
+        client = DaemonClient(address)
+        assert ''.join(client.bundle(paths=['web/index.js'])) == (
+            "```js\n# web/index.js\nindex = 1\n```\n\n"
+        )
+
+        response = raw_request(socket.AF_UNIX, address, {'action': 'bundle', 'paths': 'abc'})
+        assert response == {'type': 'error', 'message': "'paths' must be a list of strings"}
+        response = raw_request(socket.AF_UNIX, address, {'action': 'bundle', 'preset': 1})
+        assert response['type'] == 'error'
+    finally:
+        server.shutdown()
+        close_server(server)
+
+def test_unix_socket_is_not_taken_over(index, tmp_path):
+    address = str(tmp_path / 'fw.sock')
+    first = serve(create_server(address, index))
+    try:
+        with pytest.raises(ValueError, match="already running"):
+            create_server(address, index)
+        assert DaemonClient(address).ping()
+    finally:
+        first.shutdown()
+        first.server_close()
+
+    # The socket of a daemon that is gone is replaced
+    second = serve(create_server(address, index))
+    try:
+        # Closing the old server must not remove the new daemon's socket
+        close_server(first)
+        assert DaemonClient(address).ping()
+    finally:
+        second.shutdown()
+        close_server(second)
+    assert not (tmp_path / 'fw.sock').exists()
+
+def test_tcp_server_requires_token(index, tmp_path):
+    token_file = str(tmp_path / 'daemon.token')
+    server = serve(create_server('127.0.0.1:0', index, token_file))
+    try:
+        address = f"127.0.0.1:{server.server_address[1]}"
+        assert DaemonClient(address, token_file=token_file).ping() == [root.path for root in index.roots]
+        with pytest.raises(DaemonError):
+            DaemonClient(address, token_file=str(tmp_path / 'missing')).ping()
+    finally:
+        server.shutdown()
+        close_server(server)
+
+def test_refresh_prunes_cache(index, workspace):
+    list(index.bundle(index.select(globs=['*'])))
+    cached = set(index.cache._blocks)
+    assert str(workspace / 'web' / 'index.js') in cached
+
+    (workspace / 'web' / 'index.js').unlink()
+    index.refresh()
+    assert set(index.cache._blocks) == cached - {str(workspace / 'web' / 'index.js')}
+
+def test_select_preset_ignores_pins_outside_the_index(index, workspace):
+    save_preset(str(workspace / 'api'), SelectionPreset('core', include=['src/*.py'], pinned=['../secret/key.txt']))
+    assert selected_paths(index.select(preset='core')) == ['api/src/app.py']
+    with pytest.raises(ValueError):
+        index.select(preset='missing')
+
+def test_select_preset_ignores_hidden_and_ignored_pins(index, workspace):
+    (workspace / 'api' / '.env').write_text('SECRET=1')
+    index.refresh()
+    save_preset(str(workspace / 'api'), SelectionPreset('pins', pinned=['src/app.py', '.env', 'build/out.py']))
+    assert selected_paths(index.select(preset='pins')) == ['api/src/app.py']
+
+def test_client_builds_bundle_locally(workspace, capsys):
+    save_preset(str(workspace / 'api'), SelectionPreset('core', include=['*.py'], exclude=['tests/']))
+    client_main(['--local', '--root', str(workspace / 'api'), '--root', str(workspace / 'web'), '--preset', 'core'])
+    assert capsys.readouterr().out == "```py\n# api/src/app.py\napp = 1\n```\n\n"
+
+def test_client_add_root(index, workspace, tmp_path, capsys):
+    address = str(tmp_path / 'fw.sock')
+    server = serve(create_server(address, BundleIndex()))
+    try:
+        client_main(['--connect', address, '--add-root', str(workspace / 'web'), '--glob', '*.js'])
+        assert capsys.readouterr().out == "```js\n# web/index.js\nindex = 1\n```\n\n"
+    finally:
+        server.shutdown()
+        close_server(server)
@@ -0,0 +1,37 @@
+import json
+
+from fileweave.utils.session import load_session, save_session
+
+def test_session_round_trip(tmp_path):
+    path = str(tmp_path / 'config' / 'session.json')
+    session = {
+        'roots': ['/work/api', '/work/web'],
+        'opened': ['/work/api/src'],
+        'checked': ['/work/api/src/app.py'],
+        'show_hidden': True,
+        'use_gitignore': False,
+    }
+    save_session(session, path)
+    assert load_session(path) == session
+
+def test_missing_or_corrupt_session(tmp_path):
+    path = tmp_path / 'session.json'
+    assert load_session(str(path)) == {}
+
+    path.write_text('{"roots": [')
+    assert load_session(str(path)) == {}
+
+    path.write_text('["/work/api"]')
+    assert load_session(str(path)) == {}
+
+def test_session_discards_wrong_types(tmp_path):
+    path = tmp_path / 'session.json'
+    path.write_text(json.dumps({
+        'roots': '/work/api',
+        'opened': ['/work/api/src', 1],
+        'checked': ['/work/api/src/app.py'],
+        'show_hidden': 'yes',
+        'use_gitignore': False,
+        'other': 1,
+    }))
+    assert load_session(str(path)) == {'checked': ['/work/api/src/app.py'], 'use_gitignore': False}
@@ -0,0 +1,80 @@
+import os
+
+from fileweave.utils.workspace import WorkspaceRoot, compile_patterns, find_conflict, scan_roots
+
+def make_tree(base, files):
+    for relative_path, content in files.items():
+        path = base / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+def touch_dir(path):
+    # Bump the mtime explicitly so the test doesn't depend on timestamp resolution
+    mtime = os.stat(path).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+def relative_files(root):
+    return sorted(root.relative_path(path) for path in root.files())
+
+def test_scan_respects_gitignore_and_hidden_files(tmp_path):
+    make_tree(tmp_path, {
+        '.gitignore': 'build/\n*.log\n',
+        '.env': '',
+        'src/app.py': '',
+        'src/debug.log': '',
+        'build/out.py': '',
+    })
+    root = WorkspaceRoot(str(tmp_path))
+    root.scan(show_hidden=False, use_gitignore=True)
+    assert relative_files(root) == ['src/app.py']
+
+    root.scan(show_hidden=True, use_gitignore=False)
+    assert relative_files(root) == ['.env', '.gitignore', 'build/out.py', 'src/app.py', 'src/debug.log']
+
+def test_is_stale_after_directory_change(tmp_path):
+    make_tree(tmp_path, {'src/app.py': ''})
+    root = WorkspaceRoot(str(tmp_path))
+    root.scan(show_hidden=False, use_gitignore=True)
+    assert not root.is_stale(show_hidden=False, use_gitignore=True)
+    assert root.is_stale(show_hidden=True, use_gitignore=True)
+
+    (tmp_path / 'src' / 'new.py').write_text('')
+    touch_dir(tmp_path / 'src')
+    assert root.is_stale(show_hidden=False, use_gitignore=True)
+
+    root.scan(show_hidden=False, use_gitignore=True)
+    assert relative_files(root) == ['src/app.py', 'src/new.py']
+
+def test_is_stale_after_gitignore_change(tmp_path):
+    make_tree(tmp_path, {'.gitignore': '', 'app.py': ''})
+    root = WorkspaceRoot(str(tmp_path))
+    root.scan(show_hidden=False, use_gitignore=True)
+
+    (tmp_path / '.gitignore').write_text('*.py\n')
+    touch = os.stat(tmp_path / '.gitignore').st_mtime_ns + 1_000_000_000
+    os.utime(tmp_path / '.gitignore', ns=(touch, touch))
+    assert root.is_stale(show_hidden=False, use_gitignore=True)
+
+def test_scan_roots_only_rescans_changed_roots(tmp_path):
+    make_tree(tmp_path, {'api/app.py': '', 'web/app.js': ''})
+    roots = [WorkspaceRoot(str(tmp_path / 'api')), WorkspaceRoot(str(tmp_path / 'web'))]
+    assert scan_roots(roots, show_hidden=False, use_gitignore=True) == roots
+    assert scan_roots(roots, show_hidden=False, use_gitignore=True) == []
+
+    (tmp_path / 'web' / 'index.html').write_text('')
+    touch_dir(tmp_path / 'web')
+    assert scan_roots(roots, show_hidden=False, use_gitignore=True) == [roots[1]]
+
+def test_match_files_with_negated_patterns(tmp_path):
+    make_tree(tmp_path, {'src/app.py': '', 'src/tests/test_app.py': '', 'README.md': ''})
+    root = WorkspaceRoot(str(tmp_path))
+    root.scan(show_hidden=False, use_gitignore=True)
+    matched = root.match_files(compile_patterns(['*.py', '!tests/']))
+    assert [root.relative_path(path) for path in matched] == ['src/app.py']
+
+def test_find_conflict(tmp_path):
+    make_tree(tmp_path, {'a/api/x.py': '', 'b/api/x.py': '', 'a/web/x.py': ''})
+    roots = [WorkspaceRoot(str(tmp_path / 'a' / 'api'))]
+    assert find_conflict(roots, WorkspaceRoot(str(tmp_path / 'a' / 'web'))) is None
+    assert 'same name' in find_conflict(roots, WorkspaceRoot(str(tmp_path / 'b' / 'api')))
+    assert 'overlaps' in find_conflict(roots, WorkspaceRoot(str(tmp_path / 'a')))